@@ -7,27 +7,58 @@ using basic algorithms, handles invalid data,
 prints results to console and writes them to StatisticsResults.txt.
 """
 
+import os
 import sys
 import time
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+
+import numpy as np
+
+CHUNK_SIZE = 8192
+PARALLEL_MIN_SIZE = 1 << 24
+
+
+def parse_numbers(file_path):
+    """
+    Parses a file holding one number per line with NumPy's C parser.
+    Returns None when some line is not a single number.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            table = np.loadtxt(file_path, dtype=np.float64, comments=None,
+                               ndmin=2, encoding="utf-8")
+    except ValueError:
+        return None
+
+    if table.shape[1] != 1:
+        return None
+    return table.ravel()
 
 
 def read_numbers(file_path):
     """
-    Reads numbers from a file.
+    Reads numbers from a file into a NumPy array.
     Invalid data is reported but does not stop execution.
     """
     numbers = []
     errors = []
 
     try:
+        parsed = parse_numbers(file_path)
+        if parsed is not None:
+            return parsed, errors
+
         with open(file_path, "r", encoding="utf-8") as file:
             for line_num, line in enumerate(file, start=1):
                 value = line.strip()
                 if value == "":
                     continue
                 try:
-                    number = float(value)
-                    numbers.append(number)
+                    numbers.append(float(value))
                 except ValueError:
                     errors.append(
                         f"Invalid data at line {line_num}: '{value}'"
@@ -36,85 +67,118 @@ def read_numbers(file_path):
         print(f"Error: File not found -> {file_path}")
         sys.exit(1)
 
-    return numbers, errors
+    return np.array(numbers, dtype=np.float64), errors
 
 
-def compute_mean(data):
+def chunk_moments(chunk):
     """
-    Function to compute the mean value of a list of numbers
-    
-    :param data: list of numbers
+    Function to compute the mean and M2 (sum of squared deviations)
+    of a chunk of numbers with NumPy reductions
+
+    :param chunk: array of numbers
     """
-    total = 0.0
-    count = 0
-    for value in data:
-        total += value
-        count += 1
-    return total / count if count > 0 else 0.0
+    chunk_mean = chunk.mean()
+    return chunk_mean, ((chunk - chunk_mean) ** 2).sum()
 
 
-def compute_median(data):
+def combine_moments(left, right):
     """
-    Function to compute the median value of a list of numbers
-    
-    :param data: list of numbers
+    Function to merge two (count, mean, M2) partial aggregates using
+    Welford's update generalised to batches (Chan et al.)
+
+    :param left: (count, mean, M2) of the first batch
+    :param right: (count, mean, M2) of the second batch
     """
-    sorted_data = sorted(data)
-    n = len(sorted_data)
+    count_a, mean_a, m2_a = left
+    count_b, mean_b, m2_b = right
+    if count_a == 0:
+        return right
+    if count_b == 0:
+        return left
 
-    if n == 0:
-        return 0.0
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta * delta * count_a * count_b / count
+    return count, mean, m2
 
-    mid = n // 2
-    if n % 2 == 0:
-        return (sorted_data[mid - 1] + sorted_data[mid]) / 2.0
-    return sorted_data[mid]
 
+def array_moments(data):
+    """
+    Function to compute the (count, mean, M2) aggregate of an array
+    of numbers by merging the moments of its cache-sized chunks
 
-def compute_mode(data):
+    :param data: array of numbers
     """
-    Function to compute the mode value of a list of numbers
-    
-    :param data: list of numbers
-    """
-    frequency = {}
-    for value in data:
-        if value in frequency:
-            frequency[value] += 1
-        else:
-            frequency[value] = 1
-
-    max_count = 0
-    modes = []
-    for value, count in frequency.items():
-        if count > max_count:
-            max_count = count
-            modes = [value]
-        elif count == max_count:
-            modes.append(value)
+    moments = (0, 0.0, 0.0)
+    for start in range(0, data.size, CHUNK_SIZE):
+        chunk = data[start:start + CHUNK_SIZE]
+        chunk_mean, chunk_m2 = chunk_moments(chunk)
+        moments = combine_moments(moments, (chunk.size, chunk_mean, chunk_m2))
+    return moments
 
-    if max_count == 1:
-        return None
-    return modes
 
+def chunked_parallel_compute(data, parts, compute_part, combine):
+    """
+    Function to split an array into parts, compute each part on its own
+    thread and fold the partial results in order
 
-def compute_variance(data, mean):
+    :param data: array of numbers
+    :param parts: number of parts and worker threads
+    :param compute_part: function returning the partial result of a part
+    :param combine: function merging two partial results
     """
-    Function to compute the variance value of a list of numbers
-    
-    :param data: list of numbers
-    :param mean: mean of the list of numbers
+    with ThreadPoolExecutor(max_workers=parts) as executor:
+        partials = executor.map(compute_part, np.array_split(data, parts))
+        return reduce(combine, partials)
+
+
+def compute_mean_variance(data):
+    """
+    Function to compute the mean and variance of an array of numbers
+    in a single pass over cache-sized chunks, split across CPU cores
+    for very large arrays
+
+    :param data: array of numbers
+    """
+    workers = os.cpu_count() or 1
+    if data.size >= PARALLEL_MIN_SIZE and workers > 1:
+        moments = chunked_parallel_compute(data, workers, array_moments,
+                                           combine_moments)
+    else:
+        moments = array_moments(data)
+
+    count, mean, m2 = moments
+    if count == 0:
+        return 0.0, 0.0
+    return float(mean), float(m2 / count)
+
+
+def compute_median(data):
     """
-    total = 0.0
-    n = len(data)
-    if n == 0:
+    Function to compute the median value of an array of numbers
+
+    :param data: array of numbers
+    """
+    if data.size == 0:
         return 0.0
+    return float(np.median(data))
 
-    for value in data:
-        diff = value - mean
-        total += diff * diff
 
-    return total / n
+def compute_mode(data):
+    """
+    Function to compute the mode value of an array of numbers
+
+    :param data: array of numbers
+    """
+    frequency = Counter(data.tolist())
+    if not frequency:
+        return None
+
+    max_count = frequency.most_common(1)[0][1]
+    if max_count == 1:
+        return None
+    return [value for value, count in frequency.items() if count == max_count]
 
 
 def compute_std_dev(variance):
@@ -143,21 +207,20 @@ def main():
 
     numbers, errors = read_numbers(file_path)
 
-    if len(numbers) == 0:
+    if numbers.size == 0:
         print("No valid numeric data found.")
         sys.exit(1)
 
-    mean = compute_mean(numbers)
+    mean, variance = compute_mean_variance(numbers)
     median = compute_median(numbers)
     mode = compute_mode(numbers)
-    variance = compute_variance(numbers, mean)
     std_dev = compute_std_dev(variance)
 
     elapsed_time = time.time() - start_time
 
     results = []
     results.append("DESCRIPTIVE STATISTICS RESULTS\n")
-    results.append(f"Total valid numbers: {len(numbers)}\n")
+    results.append(f"Total valid numbers: {numbers.size}\n")
     results.append(f"Mean: {mean}\n")
     results.append(f"Median: {median}\n")
 
@@ -175,12 +238,11 @@ def main():
         for error in errors:
             results.append(error + "\n")
 
-    output_text = "".join(results)
-
-    print(output_text)
+    sys.stdout.writelines(results)
+    print()
 
     with open("StatisticsResults.txt", "w", encoding="utf-8") as out_file:
-        out_file.write(output_text)
+        out_file.writelines(results)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+"""
+Tests for the chunked mean and variance of compute_statistics
+"""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import compute_statistics
+
+
+class TestMeanVariance(unittest.TestCase):
+    """
+    Test the chunked moments against NumPy on both execution paths
+    """
+
+    def setUp(self):
+        # Large offset so naive sum-of-squares formulas lose precision
+        self.data = 1e9 + np.random.default_rng(0).random(100_003)
+
+    def assert_matches_numpy(self, mean, variance):
+        """
+        Assert that the moments match np.mean and np.var of the data
+        """
+        np.testing.assert_allclose(mean, np.mean(self.data), rtol=1e-12)
+        np.testing.assert_allclose(variance, np.var(self.data), rtol=1e-9)
+
+    def test_sequential_matches_numpy(self):
+        """
+        Arrays below PARALLEL_MIN_SIZE are reduced on a single thread
+        """
+        with patch.object(compute_statistics, "CHUNK_SIZE", 4096):
+            mean, variance = compute_statistics.compute_mean_variance(
+                self.data)
+        self.assert_matches_numpy(mean, variance)
+
+    def test_parallel_matches_numpy(self):
+        """
+        Arrays above PARALLEL_MIN_SIZE are split across worker threads
+        """
+        parallel = compute_statistics.chunked_parallel_compute
+        with patch.object(compute_statistics, "PARALLEL_MIN_SIZE", 1), \
+                patch.object(compute_statistics, "CHUNK_SIZE", 4096), \
+                patch("os.cpu_count", return_value=4), \
+                patch.object(compute_statistics, "chunked_parallel_compute",
+                             wraps=parallel) as spy:
+            mean, variance = compute_statistics.compute_mean_variance(
+                self.data)
+        spy.assert_called_once()
+        self.assert_matches_numpy(mean, variance)
+
+    def test_empty_array(self):
+        """
+        An empty array has zero mean and variance
+        """
+        self.assertEqual(
+            compute_statistics.compute_mean_variance(np.array([])),
+            (0.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ console and writes them to ConvertionResults.txt.
 
 import sys
 import time
+from functools import lru_cache
 
 
 def read_numbers(file_path):
@@ -40,59 +41,24 @@ def read_numbers(file_path):
     return numbers, errors
 
 
+@lru_cache(maxsize=None)
 def to_binary(number):
     """
     Converts an integer to binary.
     """
-    if number == 0:
-        return "0"
-
-    is_negative = number < 0
-    number = abs(number)
-
-    digits = []
-
-    while number > 0:
-        remainder = number % 2
-        digits.append(str(remainder))
-        number = number // 2
-
-    binary = ""
-    for i in range(len(digits) - 1, -1, -1):
-        binary += digits[i]
-
-    if is_negative:
-        binary = "-" + binary
-
-    return binary
+    if number < 0:
+        return "-" + format(-number, "b")
+    return format(number, "b")
 
 
+@lru_cache(maxsize=None)
 def to_hexadecimal(number):
     """
     Converts an integer to hexadecimal.
     """
-    if number == 0:
-        return "0"
-
-    hex_chars = "0123456789ABCDEF"
-    is_negative = number < 0
-    number = abs(number)
-
-    digits = []
-
-    while number > 0:
-        remainder = number % 16
-        digits.append(hex_chars[remainder])
-        number = number // 16
-
-    hexadecimal = ""
-    for i in range(len(digits) - 1, -1, -1):
-        hexadecimal += digits[i]
-
-    if is_negative:
-        hexadecimal = "-" + hexadecimal
-
-    return hexadecimal
+    if number < 0:
+        return "-" + format(-number, "X")
+    return format(number, "X")
 
 
 def main():
@@ -128,22 +94,21 @@ def main():
         f"\nExecution Time (seconds): {elapsed_time}\n"
     )
 
-    output_text = "".join(results_lines)
+    error_lines = [error + "\n" for error in errors]
 
-    print(output_text)
+    sys.stdout.writelines(results_lines)
+    print()
 
     if errors:
         print("ERRORS FOUND:")
-        for error in errors:
-            print(error)
+        sys.stdout.writelines(error_lines)
 
     with open("ConvertionResults.txt", "w", encoding="utf-8") as out_file:
-        out_file.write(output_text)
+        out_file.writelines(results_lines)
 
         if errors:
             out_file.write("\nERRORS FOUND:\n")
-            for error in errors:
-                out_file.write(error + "\n")
+            out_file.writelines(error_lines)
 
 
 if __name__ == "__main__":
@@ -7,93 +7,57 @@ using basic algorithms, handles invalid data, prints results to console
 and writes them to WordCountResults.txt.
 """
 
+import re
+import string
 import sys
 import time
+from collections import Counter
 
-
-def is_letter(character):
-    """
-    Checks if a character is a letter.
-    """
-    return ("a" <= character <= "z") or ("A" <= character <= "Z")
-
-
-def normalize_word(word):
-    """
-    Converts a word to lowercase.
-    """
-    normalized = ""
-    for char in word:
-        if "A" <= char <= "Z":
-            normalized += chr(ord(char) + 32)
-        else:
-            normalized += char
-    return normalized
+WORD_PATTERN = re.compile(r"[A-Za-z]+")
+READ_CHUNK_SIZE = 1 << 20
 
 
 def extract_words(text):
     """
     Extracts words from text.
     """
-    words = []
-    current_word = ""
-
-    for char in text:
-        if is_letter(char):
-            current_word += char
-        else:
-            if current_word != "":
-                words.append(current_word)
-                current_word = ""
-
-    if current_word != "":
-        words.append(current_word)
+    return WORD_PATTERN.findall(text)
 
-    return words
 
-
-def count_words(words):
+def count_file_words(file_path):
     """
-    Counts word frequencies.
+    Streams the file in chunks and counts its lower case words.
+    A word cut by a chunk boundary is carried over to the next chunk.
     """
-    distinct_words = []
-    frequencies = []
-
-    for word in words:
-        found = False
-        for index, existing_word in enumerate(distinct_words):
-            if existing_word == word:
-                frequencies[index] += 1
-                found = True
-                break
+    frequencies = Counter()
+    carry = ""
 
-        if not found:
-            distinct_words.append(word)
-            frequencies.append(1)
-
-    return distinct_words, frequencies
-
-
-def read_file(file_path):
-    """
-    Reads the file content.
-    """
     try:
         with open(file_path, "r", encoding="utf-8") as file:
-            return file.read(), None
+            while True:
+                chunk = file.read(READ_CHUNK_SIZE)
+                if chunk == "":
+                    break
+
+                text = carry + chunk
+                split = len(text.rstrip(string.ascii_letters))
+                carry = text[split:]
+                frequencies.update(map(str.lower, extract_words(text[:split])))
     except FileNotFoundError:
         return None, "File not found."
     except OSError:
         return None, "Error reading the file."
 
+    frequencies.update(map(str.lower, extract_words(carry)))
+    return frequencies, None
+
 
 def main():
     """
     Main function which:
-    1. Runs a function to retrieve words from the file.
-    2. Runs a function to make the words lower case.
-    3. Counts the frequency of each word.
-    4. Shows results in console and appends them to a file.
+    1. Runs a function to stream the words from the file.
+    2. Makes the words lower case and counts the frequency of each one.
+    3. Shows results in console and appends them to a file.
     """
     if len(sys.argv) < 2:
         print("Usage: python word_count.py fileWithData.txt")
@@ -103,27 +67,19 @@ def main():
 
     start_time = time.time()
 
-    content, error = read_file(file_path)
+    frequencies, error = count_file_words(file_path)
 
     if error is not None:
         print(f"Error reading file: {error}")
         sys.exit(1)
 
-    words = extract_words(content)
-
-    normalized_words = []
-    for word in words:
-        normalized_words.append(normalize_word(word))
-
-    distinct_words, frequencies = count_words(normalized_words)
-
     results_lines = []
     results_lines.append("WORD COUNT RESULTS\n")
     results_lines.append("Word\tFrequency\n")
 
-    for ind, word in enumerate(distinct_words):
+    for word, frequency in frequencies.items():
         results_lines.append(
-            f"{word}\t{frequencies[ind]}\n"
+            f"{word}\t{frequency}\n"
         )
 
     elapsed_time = time.time() - start_time
@@ -131,12 +87,11 @@ def main():
         f"\nExecution Time (seconds): {elapsed_time}\n"
     )
 
-    output_text = "".join(results_lines)
-
-    print(output_text)
+    sys.stdout.writelines(results_lines)
+    print()
 
     with open("WordCountResults.txt", "w", encoding="utf-8") as out_file:
-        out_file.write(output_text)
+        out_file.writelines(results_lines)
 
 
 
@@ -10,6 +10,20 @@ import sys
 import time
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads_json(raw):
+    """
+    Parse JSON bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)  # pylint: disable=no-member
+    return json.loads(raw)
+
 
 def load_json(file_path):
     """
@@ -17,26 +31,23 @@ def load_json(file_path):
     Returns data and error message when finding exceptions.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file), None
+        with open(file_path, "rb") as file:
+            return loads_json(file.read()), None
     except FileNotFoundError:
         return None, f"File not found: {file_path}"
-    except json.JSONDecodeError:
+    except ValueError:
         return None, f"Invalid JSON format in file: {file_path}"
     except OSError:
         return None, f"Error reading file: {file_path}"
 
 
-def build_price_catalogue(catalogue, sales):
+def build_price_dictionary(catalogue):
     """
-    Build a dictionary aggregating a list of
-    product name, quantity & price by sale ID.
+    Build a dictionary mapping each catalogue product title to its price.
 
     :param catalogue: catalogue list
-    :param sales: sales list
     """
     errors = []
-    sales_dictionary = {}
     price_dictionary = {}
 
     for index, product in enumerate(catalogue):
@@ -57,10 +68,30 @@ def build_price_catalogue(catalogue, sales):
 
         price_dictionary[title] = price
 
+    return price_dictionary, errors
+
+
+def compute_sales(catalogue, sales):
+    """
+    Compute the total cost of each sale ID and the overall total
+    in a single pass over the sales, pricing them with the catalogue.
+    The overall total adds the sale totals in first-seen order.
+
+    :param catalogue: catalogue list
+    :param sales: sales list
+    """
+    price_dictionary, errors = build_price_dictionary(catalogue)
+    sales_total = {}
+
     for index, sale in enumerate(sales):
-        sale_id = sale.get("SALE_ID")
-        product = sale.get("Product")
-        quantity = sale.get("Quantity")
+        try:
+            sale_id = sale["SALE_ID"]
+            product = sale["Product"]
+            quantity = sale["Quantity"]
+        except KeyError:
+            sale_id = sale.get("SALE_ID")
+            product = sale.get("Product")
+            quantity = sale.get("Quantity")
         price = price_dictionary.get(product)
 
         if price is None:
@@ -87,44 +118,21 @@ def build_price_catalogue(catalogue, sales):
             )
             continue
 
-        if sale_id in sales_dictionary:
-            sales_dictionary[sale_id].append({"Product": product,
-                                              "Quantity": quantity,
-                                              "Price": price})
-        else:
-            sales_dictionary[sale_id] = [{"Product": product,
-                                          "Quantity": quantity,
-                                          "Price": price}]
+        line_total = price * quantity
+        sales_total[sale_id] = sales_total.get(sale_id, 0) + line_total
 
-    return sales_dictionary, errors
-
-
-def compute_sales_total(sales_data):
-    """
-    Compute total cost of all sales and total cost.
-
-    :param sales_data: merged sales and catalogue dictionary
-    """
-    sales_total = {}
     total = 0
+    for sale_total in sales_total.values():
+        total += sale_total
 
-    for sale_id, sales in sales_data.items():
-        for index, sale in enumerate(sales):
-            if index == 0:
-                sales_total[sale_id] = sale["Price"] * sale["Quantity"]
-            else:
-                sales_total[sale_id] += sale["Price"] * sale["Quantity"]
-            total += sale["Price"] * sale["Quantity"]
-
-    return sales_total, total
+    return sales_total, total, errors
 
 
 def main():
     """
     Main function which:
     1. Reads and stores the JSON files into lists.
-    2. Merges the catalogue and sales into a single dictionary.
-    3. Computes total cost.
+    2. Prices the sales with the catalogue and computes total cost.
     """
     if len(sys.argv) < 3:
         print(
@@ -152,13 +160,12 @@ def main():
         errors.append(error)
         sales_data = []
 
-    sales_data, error = build_price_catalogue(catalogue_data, sales_data)
+    sales_total, total_cost, error = compute_sales(catalogue_data,
+                                                   sales_data)
 
     if len(error) > 0:
         errors.extend(error)
 
-    sales_total, total_cost = compute_sales_total(sales_data)
-
     elapsed_time = time.time() - start_time
 
     results_lines = []
@@ -180,11 +187,11 @@ def main():
         for error in errors:
             results_lines.append(f"- {error}\n")
 
-    output_text = "".join(results_lines)
-    print(output_text)
+    sys.stdout.writelines(results_lines)
+    print()
 
     with open("SalesResults.txt", "w", encoding="utf-8") as out_file:
-        out_file.write(output_text)
+        out_file.writelines(results_lines)
 
 
 if __name__ == "__main__":
@@ -4,14 +4,36 @@ Hotel Reservation System
 
 import json
 import os
+import shutil
+import sys
+import tempfile
 import unittest
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from functools import cached_property
 from io import StringIO
 from unittest.mock import patch
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATA_DIR = "A6.2/data"
 HOTELS_FILE = os.path.join(DATA_DIR, "hotels.json")
 CUSTOMERS_FILE = os.path.join(DATA_DIR, "customers.json")
 RESERVATIONS_FILE = os.path.join(DATA_DIR, "reservations.json")
+RESERVED_ROOMS_FILE = os.path.join(DATA_DIR, "reserved_rooms.json")
+
+# When set, JSON files are kept as bytes in MEMORY_STORE instead of on disk
+MEMORY_BACKEND = False
+MEMORY_STORE = {}
+
+# Larger room counts and numbers keep their reservations in a set
+BITMAP_MAX_ROOMS = 10_000
+
+SAVE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="save")
 
 
 def ensure_data_dir():
@@ -19,44 +41,156 @@ def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
 
+def dumps_json(data):
+    """Serialize data to indented JSON bytes, using orjson if present."""
+    if orjson is not None:
+        # pylint: disable=no-member
+        # Non-str keys become strings, as json.dumps does
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def loads_json(raw):
+    """Parse JSON bytes, using orjson if present."""
+    if orjson is not None:
+        return orjson.loads(raw)  # pylint: disable=no-member
+    return json.loads(raw)
+
+
 def load_json(path):
     """Load JSON safely, handling invalid data."""
-    if not os.path.exists(path):
-        return {}
+    if MEMORY_BACKEND:
+        return loads_json(MEMORY_STORE[path]) if path in MEMORY_STORE else {}
 
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (json.JSONDecodeError, OSError) as error:
+        with open(path, "rb") as file:
+            return loads_json(file.read())
+    except FileNotFoundError:
+        return {}
+    except (ValueError, OSError) as error:
         print(f"[ERROR] Could not read {path}: {error}")
         return {}
 
 
-def save_json(path, data):
-    """Save JSON safely."""
+def save_bytes(path, payload):
+    """Save bytes safely, replacing the file atomically once synced."""
+    temp_path = path + ".tmp"
     try:
-        with open(path, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+        with open(temp_path, "wb") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
     except OSError as error:
+        with suppress(OSError):
+            os.remove(temp_path)
         print(f"[ERROR] Could not write {path}: {error}")
 
 
+def save_json(path, data):
+    """Save JSON safely, replacing the file atomically once synced."""
+    if MEMORY_BACKEND:
+        MEMORY_STORE[path] = dumps_json(data)
+        return
+
+    save_bytes(path, dumps_json(data))
+
+
+def intern_id(value):
+    """Intern string IDs, leaving other values as they are."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class Hotel:
     """Hotel entity."""
 
+    __slots__ = ("hotel_id", "name", "rooms", "reserved")
+
     def __init__(self, hotel_id, name, rooms):
-        self.hotel_id = hotel_id
+        self.hotel_id = intern_id(hotel_id)
         self.name = name
         self.rooms = rooms
-        self.reserved_rooms = []
+        self.reserved = self._empty_reserved()
+
+    @staticmethod
+    def _fits_bitmap(number):
+        return isinstance(number, int) and 0 <= number <= BITMAP_MAX_ROOMS
+
+    def _empty_reserved(self):
+        # Bitmap, bit (n - 1) % 8 of byte (n - 1) // 8 is set for room n
+        if self._fits_bitmap(self.rooms):
+            return bytearray((self.rooms + 7) // 8)
+        return set()
+
+    def _uses_set(self, room_number):
+        """Check whether room_number is kept in a set, switching to one"""
+        if isinstance(self.reserved, set):
+            return True
+        if self._fits_bitmap(room_number):
+            return False
+        self.reserved = set(self.reserved_rooms)
+        return True
+
+    @property
+    def reserved_rooms(self):
+        """Return a sorted copy of the reserved room numbers"""
+        if isinstance(self.reserved, set):
+            return sorted(self.reserved)
+        return [index * 8 + bit + 1
+                for index, byte in enumerate(self.reserved) if byte
+                for bit in range(8) if byte >> bit & 1]
+
+    @reserved_rooms.setter
+    def reserved_rooms(self, room_numbers):
+        self.reserved = self._empty_reserved()
+        for room_number in room_numbers:
+            self.reserve(room_number)
+
+    def is_reserved(self, room_number):
+        """Check whether a room is reserved"""
+        if isinstance(self.reserved, set):
+            return room_number in self.reserved
+        if not self._fits_bitmap(room_number):
+            return room_number in self.reserved_rooms
+        index, bit = divmod(room_number - 1, 8)
+        return (0 <= index < len(self.reserved)
+                and bool(self.reserved[index] >> bit & 1))
+
+    def reserve(self, room_number):
+        """Mark a room as reserved, False if invalid or already reserved"""
+        if room_number < 1 or self.is_reserved(room_number):
+            return False
+
+        if self._uses_set(room_number):
+            self.reserved.add(room_number)
+            return True
+
+        index, bit = divmod(room_number - 1, 8)
+        if index >= len(self.reserved):
+            self.reserved.extend(bytes(index + 1 - len(self.reserved)))
+        self.reserved[index] |= 1 << bit
+        return True
+
+    def release(self, room_number):
+        """Mark a room as free, False if it was not reserved"""
+        if not self.is_reserved(room_number):
+            return False
+
+        if self._uses_set(room_number):
+            self.reserved.discard(room_number)
+            return True
+
+        index, bit = divmod(room_number - 1, 8)
+        self.reserved[index] &= ~(1 << bit)
+        return True
 
     def to_dict(self):
-        """Return hotel attributes as Dict"""
+        """Return hotel attributes as Dict, reserved rooms are kept apart"""
         return {
             "hotel_id": self.hotel_id,
             "name": self.name,
             "rooms": self.rooms,
-            "reserved_rooms": self.reserved_rooms,
         }
 
     @staticmethod
@@ -70,8 +204,10 @@ class Hotel:
 class Customer:
     """Customer entity."""
 
+    __slots__ = ("customer_id", "name", "email")
+
     def __init__(self, customer_id, name, email):
-        self.customer_id = customer_id
+        self.customer_id = intern_id(customer_id)
         self.name = name
         self.email = email
 
@@ -92,13 +228,16 @@ class Customer:
 class Reservation:
     """Reservation entity."""
 
+    __slots__ = ("reservation_id", "customer_id", "hotel_id",
+                 "room_number")
+
     def __init__(self, reservation_id,
                  customer_id,
                  hotel_id,
                  room_number):
-        self.reservation_id = reservation_id
-        self.customer_id = customer_id
-        self.hotel_id = hotel_id
+        self.reservation_id = intern_id(reservation_id)
+        self.customer_id = intern_id(customer_id)
+        self.hotel_id = intern_id(hotel_id)
         self.room_number = room_number
 
     def to_dict(self):
@@ -126,42 +265,179 @@ class Storage:
 
     def __init__(self):
         ensure_data_dir()
-        self.hotels = self._load_hotels()
-        self.customers = self._load_customers()
-        self.reservations = self._load_reservations()
+        self._records = {}
+        self._dirty = {}
+        self._batch_depth = 0
+
+    @cached_property
+    def hotels(self):
+        """Hotel instances with their reserved rooms, loaded on first use"""
+        hotels = self._load_hotels()
+        self._load_reserved_rooms(hotels)
+        return hotels
+
+    @cached_property
+    def customers(self):
+        """Customer instances, loaded on first use"""
+        return self._load_customers()
+
+    @cached_property
+    def reservations(self):
+        """Reservation instances, loaded on first use"""
+        return self._load_reservations()
+
+    @cached_property
+    def reservation_index(self):
+        """Reservation IDs by hotel and by customer, built on first use"""
+        index = {"hotel_id": defaultdict(set), "customer_id": defaultdict(set)}
+        for reservation in self.reservations.values():
+            for field, ids in index.items():
+                ids[getattr(reservation, field)].add(
+                    reservation.reservation_id)
+        return index
+
+    def __enter__(self):
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
+
+    def _collections(self):
+        return {
+            "hotels": (HOTELS_FILE, "hotels", Hotel.to_dict),
+            "reserved_rooms": (RESERVED_ROOMS_FILE, "hotels",
+                               lambda hotel: hotel.reserved_rooms),
+            "customers": (CUSTOMERS_FILE, "customers", Customer.to_dict),
+            "reservations": (RESERVATIONS_FILE, "reservations",
+                             Reservation.to_dict),
+        }
+
+    def _read(self, collection):
+        return load_json(self._collections()[collection][0])
 
     def _load_hotels(self):
-        raw = load_json(HOTELS_FILE)
-        return {k: Hotel.from_dict(v) for k, v in raw.items()}
+        raw = self._read("hotels")
+        hotels = {k: Hotel.from_dict(v) for k, v in raw.items()}
+        # Rebuilt rather than cached raw to drop legacy reserved_rooms
+        self._records["hotels"] = {k: v.to_dict() for k, v in hotels.items()}
+        return hotels
+
+    def _load_reserved_rooms(self, hotels):
+        raw = self._read("reserved_rooms")
+        for hotel_id, rooms in raw.items():
+            if hotel_id in hotels:
+                # This file replaces any legacy list kept in hotels.json
+                hotels[hotel_id].reserved_rooms = rooms
+        records = {k: v.reserved_rooms for k, v in hotels.items()}
+        self._records["reserved_rooms"] = records
+        # Rooms only listed in hotels.json must reach this file before
+        # hotels.json is next rewritten without them
+        legacy = {k for k, rooms in records.items() if rooms and k not in raw}
+        if legacy:
+            self._dirty.setdefault("reserved_rooms", set()).update(legacy)
 
     def _load_customers(self):
-        raw = load_json(CUSTOMERS_FILE)
+        raw = self._read("customers")
+        self._records["customers"] = raw
         return {k: Customer.from_dict(v) for k, v in raw.items()}
 
     def _load_reservations(self):
-        raw = load_json(RESERVATIONS_FILE)
+        raw = self._read("reservations")
+        self._records["reservations"] = raw
         return {k: Reservation.from_dict(v) for k, v in raw.items()}
 
+    def index_reservation(self, reservation):
+        """Add reservation to the hotel and customer lookup indexes"""
+        for field, index in self.reservation_index.items():
+            index[getattr(reservation, field)].add(reservation.reservation_id)
+
+    def unindex_reservation(self, reservation):
+        """Remove reservation from the hotel and customer lookup indexes"""
+        for field, index in self.reservation_index.items():
+            index[getattr(reservation, field)].discard(
+                reservation.reservation_id)
+
+    def _refresh_records(self, collection):
+        _, attribute, serialize = self._collections()[collection]
+        entities = getattr(self, attribute)  # loads the collection if needed
+        records = self._records[collection]
+        for key in self._dirty.pop(collection, ()):
+            entity = entities.get(key)
+            if entity is None:
+                records.pop(key, None)
+            else:
+                records[key] = serialize(entity)
+        return records
+
+    def _rebuild_records(self, collection):
+        _, attribute, serialize = self._collections()[collection]
+        entities = getattr(self, attribute)
+        self._dirty.pop(collection, None)
+        self._records[collection] = {
+            k: serialize(v) for k, v in entities.items()}
+        return self._records[collection]
+
+    def _save_file(self, collection, records):
+        save_json(self._collections()[collection][0], records)
+
+    def _save_collections(self, collections, rebuild=False):
+        build = self._rebuild_records if rebuild else self._refresh_records
+        writes = [(collection, build(collection))
+                  for collection in collections]
+        if len(writes) == 1:
+            self._save_file(*writes[0])
+            return
+
+        # Files are written and synced concurrently, records built above
+        for future in [SAVE_POOL.submit(self._save_file, *write)
+                       for write in writes]:
+            future.result()
+
+    def _save_collection(self, collection):
+        self._save_collections([collection], rebuild=True)
+
     def save_hotel(self):
         """Save hotel instances information to JSON file"""
-        save_json(HOTELS_FILE,
-                  {k: v.to_dict() for k, v in self.hotels.items()})
+        self._save_collection("hotels")
+
+    def save_reserved_rooms(self):
+        """Save reserved rooms of every hotel to their own JSON file"""
+        self._save_collection("reserved_rooms")
 
     def save_customer(self):
         """Save customer instances information to JSON file"""
-        save_json(CUSTOMERS_FILE,
-                  {k: v.to_dict() for k, v in self.customers.items()})
+        self._save_collection("customers")
 
     def save_reservation(self):
         """Save reservation instances information to JSON file"""
-        save_json(RESERVATIONS_FILE,
-                  {k: v.to_dict() for k, v in self.reservations.items()})
+        self._save_collection("reservations")
 
     def save_all(self):
         """Save all instances information to JSON files"""
-        self.save_hotel()
-        self.save_customer()
-        self.save_reservation()
+        self._save_collections(list(self._collections()), rebuild=True)
+
+    @contextmanager
+    def batch(self):
+        """Defer saving until the block ends, then save each change once"""
+        with self:
+            yield self
+
+    def mark_dirty(self, key, *collections):
+        """Flag a record as changed, saving it unless batching"""
+        for collection in collections:
+            self._dirty.setdefault(collection, set()).add(key)
+        if self._batch_depth == 0:
+            self.flush()
+
+    def flush(self):
+        """Save changed collections, serializing changed records only"""
+        dirty = [collection for collection in self._collections()
+                 if self._dirty.get(collection)]
+        if dirty:
+            self._save_collections(dirty)
 
 
 class HotelService:
@@ -172,13 +448,15 @@ class HotelService:
 
     def create_hotel(self, hotel):
         """Add hotel instance to storage"""
+        if self.storage.hotels.get(hotel.hotel_id) is hotel:
+            return
         self.storage.hotels[hotel.hotel_id] = hotel
-        self.storage.save_all()
+        self.storage.mark_dirty(hotel.hotel_id, "hotels", "reserved_rooms")
 
     def delete_hotel(self, hotel_id):
         """Delete a hotel instance from storage"""
         self.storage.hotels.pop(hotel_id, None)
-        self.storage.save_all()
+        self.storage.mark_dirty(hotel_id, "hotels", "reserved_rooms")
 
     def get_hotel(self, hotel_id):
         """Delete a hotel instance from storage"""
@@ -191,31 +469,31 @@ class HotelService:
             print("Hotel not found")
             return
 
-        print(f"Hotel ID: {hotel.hotel_id}")
-        print(f"Name: {hotel.name}")
-        print(f"Rooms: {hotel.rooms}")
-        print(f"Reserved: {hotel.reserved_rooms}")
+        sys.stdout.write(
+            f"Hotel ID: {hotel.hotel_id}\n"
+            f"Name: {hotel.name}\n"
+            f"Rooms: {hotel.rooms}\n"
+            f"Reserved: {hotel.reserved_rooms}\n")
 
     def modify_hotel(self, hotel_id, name, rooms):
         """Modify hotel information"""
         hotel = self.get_hotel(hotel_id)
-        if hotel:
+        if hotel and (hotel.name, hotel.rooms) != (name, rooms):
             hotel.name = name
             hotel.rooms = rooms
-            self.storage.save_all()
+            self.storage.mark_dirty(hotel_id, "hotels")
 
     def reserve_room(self, hotel_id, room_number):
         """Reserve room from hotel"""
         hotel = self.get_hotel(hotel_id)
         if not hotel:
             return False
-        if room_number in hotel.reserved_rooms:
-            return False
         if room_number > hotel.rooms:
             return False
+        if not hotel.reserve(room_number):
+            return False
 
-        hotel.reserved_rooms.append(room_number)
-        self.storage.save_all()
+        self.storage.mark_dirty(hotel_id, "reserved_rooms")
         return True
 
     def cancel_room(self, hotel_id, room_number):
@@ -224,11 +502,11 @@ class HotelService:
         if not hotel:
             return False
 
-        if room_number in hotel.reserved_rooms:
-            hotel.reserved_rooms.remove(room_number)
-            self.storage.save_all()
-            return True
-        return False
+        if not hotel.release(room_number):
+            return False
+
+        self.storage.mark_dirty(hotel_id, "reserved_rooms")
+        return True
 
 
 class CustomerService:
@@ -240,12 +518,12 @@ class CustomerService:
     def create_customer(self, customer):
         """Add customer instance to storage"""
         self.storage.customers[customer.customer_id] = customer
-        self.storage.save_all()
+        self.storage.mark_dirty(customer.customer_id, "customers")
 
     def delete_customer(self, customer_id):
         """Delete customer from storage"""
         self.storage.customers.pop(customer_id, None)
-        self.storage.save_all()
+        self.storage.mark_dirty(customer_id, "customers")
 
     def get_customer(self, customer_id):
         """Get customer instance from ID"""
@@ -258,17 +536,18 @@ class CustomerService:
             print("Customer not found")
             return
 
-        print(f"Customer ID: {customer.customer_id}")
-        print(f"Name: {customer.name}")
-        print(f"Email: {customer.email}")
+        sys.stdout.write(
+            f"Customer ID: {customer.customer_id}\n"
+            f"Name: {customer.name}\n"
+            f"Email: {customer.email}\n")
 
     def modify_customer(self, customer_id, name, email):
         """Modify customer information"""
         customer = self.get_customer(customer_id)
-        if customer:
+        if customer and (customer.name, customer.email) != (name, email):
             customer.name = name
             customer.email = email
-            self.storage.save_all()
+            self.storage.mark_dirty(customer_id, "customers")
 
 
 class ReservationService:
@@ -283,14 +562,21 @@ class ReservationService:
         if reservation.customer_id not in self.storage.customers:
             return False
 
-        if not self.hotel_service.reserve_room(
-                reservation.hotel_id,
-                reservation.room_number):
-            return False
-
-        self.storage.reservations[
-            reservation.reservation_id] = reservation
-        self.storage.save_all()
+        with self.storage.batch():
+            if not self.hotel_service.reserve_room(
+                    reservation.hotel_id,
+                    reservation.room_number):
+                return False
+
+            previous = self.storage.reservations.get(
+                reservation.reservation_id)
+            if previous:
+                self.storage.unindex_reservation(previous)
+            self.storage.reservations[
+                reservation.reservation_id] = reservation
+            self.storage.index_reservation(reservation)
+            self.storage.mark_dirty(
+                reservation.reservation_id, "reservations")
         return True
 
     def cancel_reservation(self, reservation_id):
@@ -299,19 +585,57 @@ class ReservationService:
         if not reservation:
             return False
 
-        self.hotel_service.cancel_room(
-            reservation.hotel_id,
-            reservation.room_number)
+        with self.storage.batch():
+            self.hotel_service.cancel_room(
+                reservation.hotel_id,
+                reservation.room_number)
 
-        del self.storage.reservations[reservation_id]
-        self.storage.save_all()
+            del self.storage.reservations[reservation_id]
+            self.storage.unindex_reservation(reservation)
+            self.storage.mark_dirty(reservation_id, "reservations")
         return True
 
+    def _lookup(self, field, value):
+        reservation_ids = self.storage.reservation_index[field].get(value, ())
+        return [self.storage.reservations[reservation_id]
+                for reservation_id in sorted(reservation_ids)]
+
+    def get_hotel_reservations(self, hotel_id):
+        """Get reservation instances of a hotel"""
+        return self._lookup("hotel_id", hotel_id)
+
+    def get_customer_reservations(self, customer_id):
+        """Get reservation instances of a customer"""
+        return self._lookup("customer_id", customer_id)
+
+
+def use_memory_backend(test_case):
+    """Keep the JSON files of a test in an emptied in-memory store"""
+    MEMORY_STORE.clear()
+    patcher = patch(__name__ + ".MEMORY_BACKEND", True)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+def use_temp_data_files(test_case):
+    """Keep the JSON files of a test on disk in a temporary directory"""
+    directory = tempfile.mkdtemp()
+    test_case.addCleanup(shutil.rmtree, directory)
+    patchers = [patch(__name__ + ".MEMORY_BACKEND", False)]
+    for name in ("HOTELS_FILE", "RESERVED_ROOMS_FILE",
+                 "CUSTOMERS_FILE", "RESERVATIONS_FILE"):
+        path = os.path.join(directory, os.path.basename(globals()[name]))
+        patchers.append(patch(f"{__name__}.{name}", path))
+    for patcher in patchers:
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
 
 class TestHotelSystem(unittest.TestCase):
     """Test Management"""
 
     def setUp(self):
+        use_memory_backend(self)
         self.storage = Storage()
         self.hotel_service = HotelService(self.storage)
         self.customer_service = CustomerService(self.storage)
@@ -323,12 +647,14 @@ class TestHotelSystem(unittest.TestCase):
         self.hotel = Hotel("H1", "Test Hotel", 10)
         self.customer = Customer("C1", "Juan", "juan@email.com")
 
-        self.hotel_service.create_hotel(self.hotel)
-        self.customer_service.create_customer(self.customer)
+        with self.storage.batch():
+            self.hotel_service.create_hotel(self.hotel)
+            self.customer_service.create_customer(self.customer)
 
     def test_invalid_json_file(self):
         """Testing an invalid JSON file"""
-        with open("A6.2/data/hotels.json", "w", encoding="utf-8") as f:
+        use_temp_data_files(self)
+        with open(HOTELS_FILE, "w", encoding="utf-8") as f:
             f.write("{ invalid json")
 
         storage = Storage()
@@ -456,5 +782,169 @@ class TestHotelSystem(unittest.TestCase):
             self.assertIn("Customer not found", fake_out.getvalue())
 
 
+class TestStorage(unittest.TestCase):
+    """Test Persistence"""
+
+    def setUp(self):
+        use_memory_backend(self)
+        self.storage = Storage()
+        self.hotel_service = HotelService(self.storage)
+
+    def test_batch_defers_writes(self):
+        """Test that a batch writes changed collections once on exit"""
+        with self.storage.batch():
+            self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+            with self.storage:
+                self.hotel_service.modify_hotel("H2", "Renamed", 6)
+            self.assertNotIn("H2", load_json(HOTELS_FILE))
+        self.assertEqual(load_json(HOTELS_FILE)["H2"]["name"], "Renamed")
+
+    def test_reservation_only_writes_reserved_rooms(self):
+        """Test that reserving a room leaves hotels.json untouched"""
+        self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        with patch(__name__ + ".save_json") as save:
+            self.hotel_service.reserve_room("H2", 4)
+        self.assertEqual(
+            [call.args[0] for call in save.call_args_list],
+            [RESERVED_ROOMS_FILE])
+        self.storage.save_reserved_rooms()
+        self.assertEqual(Storage().hotels["H2"].reserved_rooms, [4])
+
+    def test_flush_writes_each_changed_file(self):
+        """Test that a flush saves every changed collection concurrently"""
+        with patch(__name__ + ".save_json") as save:
+            self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        self.assertCountEqual(
+            [call.args[0] for call in save.call_args_list],
+            [HOTELS_FILE, RESERVED_ROOMS_FILE])
+
+    def test_reserved_rooms_bitmap(self):
+        """Test that reserved rooms round-trip through the bitmap"""
+        self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 12))
+        for room_number in (12, 0, 3, 9):
+            self.hotel_service.reserve_room("H2", room_number)
+        self.hotel_service.cancel_room("H2", 9)
+        self.assertEqual(Storage().hotels["H2"].reserved_rooms, [3, 12])
+
+    def test_numeric_ids_load(self):
+        """Test that records with numeric IDs still load"""
+        save_json(CUSTOMERS_FILE, {"7": {
+            "customer_id": 7, "name": "Ana", "email": "ana@email.com"}})
+        self.assertEqual(Storage().customers["7"].customer_id, 7)
+
+    def test_numeric_ids_save(self):
+        """Test that entities created with numeric IDs are saved"""
+        self.hotel_service.create_hotel(Hotel(1, "Test Hotel 1", 5))
+        CustomerService(self.storage).create_customer(
+            Customer(7, "Ana", "ana@email.com"))
+        self.assertEqual(load_json(HOTELS_FILE)["1"]["hotel_id"], 1)
+        self.assertEqual(load_json(RESERVED_ROOMS_FILE)["1"], [])
+        self.assertEqual(load_json(CUSTOMERS_FILE)["7"]["customer_id"], 7)
+
+    def test_reserved_rooms_outside_bitmap(self):
+        """Test room counts and numbers the bitmap cannot hold"""
+        self.assertEqual(Hotel("H2", "Test Hotel 2", -9).reserved, set())
+        self.assertEqual(Hotel("H2", "Test Hotel 2", 10**10).reserved, set())
+        hotel = Hotel.from_dict({"hotel_id": "H2", "name": "Test Hotel 2",
+                                 "rooms": 5, "reserved_rooms": [10**9, 2]})
+        self.assertEqual(hotel.reserved, {2, 10**9})
+        self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        self.assertTrue(self.hotel_service.reserve_room("H2", 2.0))
+        self.assertFalse(self.hotel_service.reserve_room("H2", 2))
+        self.assertTrue(self.hotel_service.cancel_room("H2", 2))
+
+    def test_legacy_reserved_rooms_survive_hotel_save(self):
+        """Test that rooms only kept in hotels.json are not lost"""
+        save_json(HOTELS_FILE, {"H2": {
+            "hotel_id": "H2", "name": "Test Hotel 2", "rooms": 5,
+            "reserved_rooms": [2]}})
+        HotelService(Storage()).modify_hotel("H2", "Renamed", 5)
+        self.assertNotIn("reserved_rooms", load_json(HOTELS_FILE)["H2"])
+        self.assertEqual(load_json(RESERVED_ROOMS_FILE)["H2"], [2])
+        self.assertFalse(
+            HotelService(Storage()).reserve_room("H2", 2))
+
+    def test_reserved_rooms_file_replaces_legacy_list(self):
+        """Test that reserved_rooms.json overrides rooms kept in hotels"""
+        save_json(HOTELS_FILE, {"H2": {
+            "hotel_id": "H2", "name": "Test Hotel 2", "rooms": 5,
+            "reserved_rooms": [2, 3]}})
+        hotel_service = HotelService(Storage())
+        hotel_service.cancel_room("H2", 3)
+        self.assertEqual(load_json(RESERVED_ROOMS_FILE)["H2"], [2])
+        self.assertEqual(Storage().hotels["H2"].reserved_rooms, [2])
+
+    def test_failed_save_keeps_previous_file(self):
+        """Test that an interrupted save leaves the old file intact"""
+        use_temp_data_files(self)
+        hotel_service = HotelService(Storage())
+        hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        with patch(__name__ + ".os.replace", side_effect=OSError("full")), \
+                patch("sys.stdout", new=StringIO()):
+            hotel_service.modify_hotel("H2", "Renamed", 6)
+        self.assertEqual(load_json(HOTELS_FILE)["H2"]["name"], "Test Hotel 2")
+        self.assertFalse(os.path.exists(HOTELS_FILE + ".tmp"))
+
+    def test_flush_serializes_only_changed_records(self):
+        """Test that a flush rebuilds the dicts of changed records only"""
+        self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        self.hotel_service.create_hotel(Hotel("H3", "Test Hotel 3", 5))
+        with patch.object(Hotel, "to_dict", autospec=True,
+                          side_effect=Hotel.to_dict) as to_dict:
+            self.hotel_service.modify_hotel("H2", "Renamed", 6)
+        self.assertEqual(to_dict.call_count, 1)
+        self.assertEqual(load_json(HOTELS_FILE)["H2"]["name"], "Renamed")
+
+    def test_save_all_writes_unmarked_changes(self):
+        """Test that save_all persists entities changed outside services"""
+        self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        self.storage.hotels["H2"].name = "Renamed"
+        self.storage.hotels["H3"] = Hotel("H3", "Test Hotel 3", 5)
+        self.storage.save_all()
+        hotels = load_json(HOTELS_FILE)
+        self.assertEqual(hotels["H2"]["name"], "Renamed")
+        self.assertIn("H3", hotels)
+
+    def test_unchanged_records_are_not_saved(self):
+        """Test that no-op creates and modifications skip saving"""
+        customer_service = CustomerService(self.storage)
+        hotel = Hotel("H2", "Test Hotel 2", 5)
+        self.hotel_service.create_hotel(hotel)
+        customer_service.create_customer(
+            Customer("C2", "Ana", "ana@email.com"))
+        with patch(__name__ + ".save_json") as save:
+            self.hotel_service.create_hotel(hotel)
+            self.hotel_service.modify_hotel("H2", "Test Hotel 2", 5)
+            customer_service.modify_customer("C2", "Ana", "ana@email.com")
+        save.assert_not_called()
+
+    def test_collections_load_on_first_use(self):
+        """Test that Storage only reads the files a caller touches"""
+        with patch(__name__ + ".load_json", side_effect=load_json) as load:
+            storage = Storage()
+            self.assertEqual(load.call_count, 0)
+            self.assertIsInstance(storage.customers, dict)
+        self.assertEqual(
+            [call.args[0] for call in load.call_args_list], [CUSTOMERS_FILE])
+
+    def test_reservation_indexes(self):
+        """Test that reservations can be looked up by hotel and customer"""
+        customer_service = CustomerService(self.storage)
+        reservation_service = ReservationService(
+            self.storage, self.hotel_service)
+        self.hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        customer_service.create_customer(
+            Customer("C2", "Ana", "ana@email.com"))
+        reservation = Reservation("R3", "C2", "H2", 1)
+        reservation_service.create_reservation(reservation)
+        self.assertEqual(
+            reservation_service.get_hotel_reservations("H2"), [reservation])
+        self.assertEqual(
+            Storage().reservation_index["customer_id"]["C2"], {"R3"})
+        reservation_service.cancel_reservation("R3")
+        self.assertEqual(
+            reservation_service.get_customer_reservations("C2"), [])
+
+
 if __name__ == "__main__":
     unittest.main()
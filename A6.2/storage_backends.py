@@ -0,0 +1,270 @@
+"""
+Opt-in storage backends for the Hotel Reservation System
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from hotel_system import (
+    DATA_DIR, HOTELS_FILE, MEMORY_STORE, Customer, CustomerService, Hotel,
+    HotelService, Reservation, ReservationService, Storage, load_json,
+    save_bytes, save_json, use_memory_backend)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SQLITE_FILE = os.path.join(DATA_DIR, "hotel_system.db")
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotels (
+    hotel_id TEXT PRIMARY KEY, name TEXT, rooms INTEGER);
+CREATE TABLE IF NOT EXISTS reserved_rooms (
+    hotel_id TEXT, room_number INTEGER,
+    PRIMARY KEY (hotel_id, room_number));
+CREATE TABLE IF NOT EXISTS customers (
+    customer_id TEXT PRIMARY KEY, name TEXT, email TEXT);
+CREATE TABLE IF NOT EXISTS reservations (
+    reservation_id TEXT PRIMARY KEY, customer_id TEXT, hotel_id TEXT,
+    room_number INTEGER);
+CREATE INDEX IF NOT EXISTS reservations_by_hotel
+    ON reservations (hotel_id);
+CREATE INDEX IF NOT EXISTS reservations_by_customer
+    ON reservations (customer_id);
+"""
+
+
+class MsgpackStorage(Storage):
+    """Persistence layer keeping each collection in a MessagePack file."""
+
+    def __init__(self, directory=DATA_DIR):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, collection, extension=".msgpack"):
+        name = os.path.basename(self._collections()[collection][0])
+        return os.path.join(
+            self.directory, os.path.splitext(name)[0] + extension)
+
+    def _read(self, collection):
+        if msgpack is None:
+            return load_json(self._path(collection, ".json"))
+
+        path = self._path(collection)
+        try:
+            with open(path, "rb") as file:
+                # Numeric IDs are kept as numeric map keys
+                return msgpack.unpackb(file.read(), strict_map_key=False)
+        except FileNotFoundError:
+            # Carry over data saved by the JSON storage
+            return load_json(self._path(collection, ".json"))
+        except (ValueError, OSError) as error:
+            print(f"[ERROR] Could not read {path}: {error}")
+            return {}
+
+    def _save_file(self, collection, records):
+        if msgpack is None:
+            save_json(self._path(collection, ".json"), records)
+        else:
+            save_bytes(self._path(collection), msgpack.packb(records))
+
+    def export_json(self):
+        """Save every collection to its JSON file for inspection"""
+        self.save_all()
+        for collection in self._collections():
+            save_json(self._path(collection, ".json"),
+                      self._records[collection])
+
+
+class SqliteStorage(Storage):
+    """Persistence layer backed by a SQLite database."""
+
+    KEY_COLUMNS = {
+        "hotels": "hotel_id",
+        "reserved_rooms": "hotel_id",
+        "customers": "customer_id",
+        "reservations": "reservation_id",
+    }
+
+    def __init__(self, path=SQLITE_FILE):
+        super().__init__()
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SQLITE_SCHEMA)
+
+    def close(self):
+        """Save pending changes and close the database"""
+        self.flush()
+        self.connection.close()
+
+    def _read(self, collection):
+        cursor = self.connection.execute(
+            f"SELECT * FROM {collection} ORDER BY rowid")
+        if collection == "reserved_rooms":
+            raw = {}
+            for hotel_id, room_number in cursor:
+                raw.setdefault(hotel_id, []).append(room_number)
+            return raw
+
+        columns = [column[0] for column in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor}
+
+    def _write_rows(self, collection, rebuild):
+        _, attribute, serialize = self._collections()[collection]
+        entities = getattr(self, attribute)
+        key_column = self.KEY_COLUMNS[collection]
+        keys = self._dirty.pop(collection, set())
+        if rebuild:
+            stored = self.connection.execute(
+                f"SELECT {key_column} FROM {collection}")
+            keys = list(entities) + [row[0] for row in stored
+                                     if row[0] not in entities]
+
+        delete = f"DELETE FROM {collection} WHERE {key_column} = ?"
+        for key in keys:
+            entity = entities.get(key)
+            if entity is None or collection == "reserved_rooms":
+                self.connection.execute(delete, (key,))
+            if entity is None:
+                continue
+
+            record = serialize(entity)
+            if collection == "reserved_rooms":
+                self.connection.executemany(
+                    "INSERT INTO reserved_rooms VALUES (?, ?)",
+                    [(key, room_number) for room_number in record])
+            else:
+                # Updated in place so rows keep their insertion order
+                self.connection.execute(
+                    f"INSERT INTO {collection} ({', '.join(record)}) "
+                    f"VALUES ({', '.join('?' * len(record))}) "
+                    f"ON CONFLICT ({key_column}) DO UPDATE SET "
+                    + ", ".join(f"{column} = excluded.{column}"
+                                for column in record),
+                    tuple(record.values()))
+
+    def _save_collections(self, collections, rebuild=False):
+        try:
+            with self.connection:
+                for collection in collections:
+                    self._write_rows(collection, rebuild)
+        except sqlite3.Error as error:
+            print(f"[ERROR] Could not save to {self.path}: {error}")
+
+
+class TestStorageBackends(unittest.TestCase):
+    """Test Opt-in Persistence"""
+
+    def setUp(self):
+        use_memory_backend(self)
+
+    def use_msgpack_directory(self):
+        """Record the files MsgpackStorage touches in a new directory"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # Data of the default JSON storage, which must be left alone
+        save_json(HOTELS_FILE, {"H9": Hotel("H9", "Other", 1).to_dict()})
+        spies = []
+        for name in ("load_json", "save_json", "save_bytes"):
+            patcher = patch(f"{__name__}.{name}", wraps=globals()[name])
+            spies.append(patcher.start())
+            self.addCleanup(patcher.stop)
+        return directory, spies
+
+    def assert_inside(self, directory, spies):
+        """Assert that every file touched or stored is in directory"""
+        paths = [call.args[0] for spy in spies for call in spy.call_args_list]
+        self.assertTrue(paths)
+        for path in paths + list(MEMORY_STORE):
+            if path != HOTELS_FILE:
+                self.assertEqual(os.path.dirname(path), directory)
+        self.assertEqual(list(load_json(HOTELS_FILE)), ["H9"])
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_msgpack_storage_round_trip(self):
+        """Test that MsgpackStorage persists records and exports JSON"""
+        directory, spies = self.use_msgpack_directory()
+        save_json(os.path.join(directory, "customers.json"), {
+            "C1": Customer("C1", "Juan", "juan@email.com").to_dict()})
+        storage = MsgpackStorage(directory)
+        hotel_service = HotelService(storage)
+        self.assertEqual(list(storage.customers), ["C1"])
+        hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+        hotel_service.create_hotel(Hotel(1, "Test Hotel 1", 5))
+        hotel_service.reserve_room("H2", 4)
+        storage.save_customer()
+        storage = MsgpackStorage(directory)
+        self.assertEqual(storage.hotels["H2"].reserved_rooms, [4])
+        self.assertEqual(storage.hotels[1].name, "Test Hotel 1")
+        self.assertEqual(list(storage.customers), ["C1"])
+        storage.export_json()
+        self.assertEqual(
+            load_json(os.path.join(directory, "reserved_rooms.json"))["H2"],
+            [4])
+        self.assert_inside(directory, spies)
+
+    def test_msgpack_storage_without_msgpack(self):
+        """Test that MsgpackStorage keeps JSON files in its directory"""
+        directory, spies = self.use_msgpack_directory()
+        with patch(__name__ + ".msgpack", None):
+            HotelService(MsgpackStorage(directory)).create_hotel(
+                Hotel("H2", "Test Hotel 2", 5))
+            self.assertEqual(
+                list(MsgpackStorage(directory).hotels), ["H2"])
+        self.assert_inside(directory, spies)
+
+    def test_sqlite_storage_round_trip(self):
+        """Test that SqliteStorage persists changed records"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hotel_system.db")
+            storage = SqliteStorage(path)
+            hotel_service = HotelService(storage)
+            customer_service = CustomerService(storage)
+            reservation_service = ReservationService(storage, hotel_service)
+            hotel_service.create_hotel(Hotel("H2", "Test Hotel 2", 5))
+            hotel_service.create_hotel(Hotel("H3", "Test Hotel 3", 5))
+            customer_service.create_customer(
+                Customer("C2", "Ana", "ana@email.com"))
+            reservation_service.create_reservation(
+                Reservation("R3", "C2", "H2", 4))
+            hotel_service.delete_hotel("H3")
+            storage.hotels["H2"].name = "Renamed"
+            storage.save_all()
+            storage.close()
+
+            storage = SqliteStorage(path)
+            self.assertEqual(list(storage.hotels), ["H2"])
+            self.assertEqual(storage.hotels["H2"].name, "Renamed")
+            self.assertEqual(storage.hotels["H2"].reserved_rooms, [4])
+            self.assertEqual(storage.customers["C2"].email, "ana@email.com")
+            self.assertEqual(storage.reservations["R3"].room_number, 4)
+            storage.close()
+
+    def test_sqlite_storage_keeps_row_order(self):
+        """Test that updating a SQLite row keeps its position"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "hotel_system.db")
+        storage = SqliteStorage(path)
+        hotel_service = HotelService(storage)
+        for hotel_id in ("H1", "H2", "H3"):
+            hotel_service.create_hotel(Hotel(hotel_id, "Test Hotel", 5))
+        hotel_service.modify_hotel("H1", "Renamed", 6)
+        storage.close()
+
+        storage = SqliteStorage(path)
+        self.assertEqual(list(storage.hotels), ["H1", "H2", "H3"])
+        self.assertEqual(storage.hotels["H1"].name, "Renamed")
+        storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()